@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+检索打分基准测试脚本
+验证单次查询的耗时只取决于查询词的倒排列表长度，而与索引总规模无关
+"""
+
+import time
+
+import numpy as np
+from scipy import sparse
+
+from main import TFIDF_QUANT_SCALE, VectorDB
+
+# 配置
+NUM_TERMS = 20000
+QUERY_TERMS = 6
+POSTING_LENGTH = 2000  # 每个查询词的倒排列表长度
+INDEX_SIZES = [(20000, 1_000_000), (200000, 8_000_000)]  # (chunk数, 非零项数)
+REPEAT = 200
+
+
+def build_index(num_chunks, nnz, rng):
+    """构造按词项组织的int8 TF-IDF矩阵，前QUERY_TERMS行的倒排列表长度固定"""
+    row_nnz = np.full(NUM_TERMS, (nnz - QUERY_TERMS * POSTING_LENGTH) // (NUM_TERMS - QUERY_TERMS))
+    row_nnz[:QUERY_TERMS] = POSTING_LENGTH
+    indptr = np.concatenate([[0], np.cumsum(row_nnz)])
+    indices = np.concatenate([np.sort(rng.choice(num_chunks, n, replace=False)) for n in row_nnz])
+    data = rng.integers(1, TFIDF_QUANT_SCALE + 1, size=indptr[-1], dtype=np.int8)
+    return sparse.csr_matrix((data, indices.astype(np.int32), indptr), shape=(NUM_TERMS, num_chunks))
+
+
+def time_per_query(func):
+    """返回单次调用耗时的中位数（毫秒）"""
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return np.median(samples) * 1000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    query_vec = sparse.csr_matrix(
+        (np.full(QUERY_TERMS, 1 / np.sqrt(QUERY_TERMS), dtype=np.float32), np.arange(QUERY_TERMS), [0, QUERY_TERMS]),
+        shape=(1, NUM_TERMS)
+    )
+
+    print("=" * 50)
+    print("检索打分基准测试")
+    print("=" * 50)
+
+    timings = []
+    for num_chunks, nnz in INDEX_SIZES:
+        db = VectorDB()
+        db.tfidf_matrix_T = build_index(num_chunks, nnz, rng)
+        db.num_chunks = num_chunks
+
+        # 与直接整体相乘的结果一致
+        indices, scores = db._score(query_vec)
+        expected = (query_vec @ db.tfidf_matrix_T).toarray().ravel() / TFIDF_QUANT_SCALE
+        assert np.allclose(expected[indices], scores, atol=1e-6)
+        assert np.count_nonzero(expected) == len(indices)
+
+        elapsed = time_per_query(lambda: db._score(query_vec))
+        full = time_per_query(lambda: query_vec @ db.tfidf_matrix_T)
+        timings.append(elapsed)
+        print(f"chunk数 {num_chunks:>7}，非零项 {db.tfidf_matrix_T.nnz:>9}："
+              f"倒排列表打分 {elapsed:.3f} ms，整体相乘 {full:.3f} ms")
+
+    # 索引规模增大一个数量级，单次查询耗时不应随之增长
+    assert timings[-1] < timings[0] * 3, "查询耗时随索引规模增长"
+    print("✅ 查询耗时与索引规模无关")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,45 @@
+import asyncio
+import hashlib
+import json
 import logging
 import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Dict, Tuple
 
-import arxiv
-import requests
+import httpx
+import numpy as np
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-# 简单的文本相似度计算，避免复杂的依赖
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+# arxiv、scipy、sklearn导入较慢，且/、/health等接口用不到，均在首次使用时再导入
+if TYPE_CHECKING:
+    # 简单的文本相似度计算，避免复杂的依赖
+    from sklearn.feature_extraction.text import TfidfVectorizer
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="ArXiv RAG API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await http_client.aclose()
+    # 退出前保存尚未落盘的增量更新
+    await asyncio.to_thread(vector_db.flush)
+
+
+# 使用orjson序列化响应，/search返回的论文摘要较长时明显快于标准库json
+app = FastAPI(title="ArXiv RAG API", version="1.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS配置
 app.add_middleware(
@@ -32,6 +54,43 @@ app.add_middleware(
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://127.0.0.1:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "qwen2.5:7b")
 VECTOR_DB_PATH = Path("data/vector_db.pkl")
+ANSWER_CACHE_PATH = Path("data/answer_cache.db")
+# 问答缓存最多保留的条数，超出后淘汰最早写入的回答
+ANSWER_CACHE_MAX_ROWS = 10000
+# 新增chunk数达到上次拟合时chunk数的该倍数时重新拟合词表
+REFIT_GROWTH_RATIO = 1.0
+# 论文摘要切分chunk的长度（字符数）
+CHUNK_SIZE = 500
+# 问答时等待后台入库任务完成的最长时间（秒）
+INGEST_WAIT_TIMEOUT = 10
+# ArXiv API单页最多返回的论文数
+ARXIV_MAX_PAGE_SIZE = 100
+# TF-IDF权重量化为int8时的缩放系数，L2归一化后的非负权重都在[0, 1]内
+TFIDF_QUANT_SCALE = 127
+# 缓存的查询向量数量上限
+QUERY_CACHE_SIZE = 512
+# 增量更新后距上次保存超过该时间（秒）才重新保存索引；重新拟合后总是立即保存
+VECTOR_DB_SAVE_INTERVAL = 300
+
+# 提示词模板
+SYSTEM_MESSAGE = {"role": "system", "content": "你是一个专业的学术助手，基于提供的论文内容回答用户问题。"}
+CONTEXT_HEADER = "以下是从相关论文中检索到的内容：\n\n"
+CONTEXT_CHUNK_TEMPLATE = "【论文 {index}】{title}\n作者：{authors}\n内容：{content}\n\n"
+PROMPT_TEMPLATE = """基于以下论文内容，请回答用户的问题。
+
+论文内容：
+{context}
+
+用户问题：{question}
+
+请基于上述论文内容提供准确、专业的回答，并注明信息来源。如果论文内容不足以回答问题，请说明情况。"""
+
+# 全局复用的HTTP客户端，保持与Ollama的连接池
+# httpx默认空闲5秒即关闭keep-alive连接，问答请求间隔通常更长，这里延长空闲保持时间
+http_client = httpx.AsyncClient(
+    timeout=60,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=10, keepalive_expiry=60)
+)
 
 
 # 数据模型
@@ -78,73 +137,343 @@ class SearchResponse(BaseModel):
     total: int
 
 
-class AskResponse(BaseModel):
-    answer: str
-    citations: List[Citation]
-
-
 # 向量数据库类
 class VectorDB:
+    # 不随索引持久化的字段
+    TRANSIENT_FIELDS = ('lock', 'ingest_lock', 'loaded', 'query_cache', 'dirty', 'last_saved')
+
     def __init__(self):
         self.index = None
-        self.papers = []
-        self.chunks = []
         self.embeddings = []
+        # 入库在后台线程中进行，读写索引都需持有该锁
+        self.lock = threading.Lock()
+        # 保证同一时间只有一个入库任务在构建新索引
+        self.ingest_lock = threading.Lock()
+        # 是否已从磁盘加载过保存的索引
+        self.loaded = False
+        # 论文元数据，按paper_id索引
+        self.papers_by_id: Dict[str, Paper] = {}
+        # chunk按列存储：第i个chunk所属论文、在论文中的序号和内容
+        # 前两个数组按容量翻倍扩展，num_chunks为实际使用的长度
+        self.num_chunks = 0
+        self.chunk_paper_id = np.empty(0, dtype=object)
+        self.chunk_index = np.empty(0, dtype=np.int32)
+        self.chunk_content: List[str] = []
+        self.vectorizer = None
+        # 按词项组织的TF-IDF矩阵 (词表大小 x chunk数)，每行即一个词的倒排列表
+        # 权重按TFIDF_QUANT_SCALE量化为int8存储
+        self.tfidf_matrix_T = None
+        # 上次拟合词表时的chunk数量
+        self.fitted_count = 0
+        # 查询文本到TF-IDF查询向量的LRU缓存，随词表重新拟合而清空
+        self.query_cache = OrderedDict()
+        # 是否有尚未保存到磁盘的更新，以及上次保存的时间
+        self.dirty = False
+        self.last_saved = time.monotonic()
+
+    def _reserve(self, size: int):
+        """保证chunk数组至少能容纳size个chunk"""
+        if size > len(self.chunk_index):
+            capacity = max(size, 2 * len(self.chunk_index), 64)
+            self.chunk_paper_id = np.resize(self.chunk_paper_id, capacity)
+            self.chunk_index = np.resize(self.chunk_index, capacity)
 
     def add_papers(self, papers: List[Paper]):
-        """添加论文到向量数据库"""
-        for paper in papers:
-            # 将论文摘要分成多个chunk
-            chunk_size = 500
-            summary_chunks = [paper.summary[i:i + chunk_size] for i in range(0, len(paper.summary), chunk_size)]
-
-            for i, chunk in enumerate(summary_chunks):
-                self.chunks.append({
-                    'paper_id': paper.paper_id,
-                    'title': paper.title,
-                    'authors': paper.authors,
-                    'arxiv_url': paper.arxiv_url,
-                    'pdf_url': paper.pdf_url,
-                    'chunk_index': i,
-                    'content': chunk
-                })
-
-        # 使用TF-IDF进行文本相似度计算（简化版本）
-        if self.chunks:
-            self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-            texts = [chunk['content'] for chunk in self.chunks]
-            self.tfidf_matrix = self.vectorizer.fit_transform(texts)
-            logger.info(f"向量数据库已更新，包含 {len(self.chunks)} 个chunk")
-
-    def search(self, query: str, top_k: int = 5) -> List[Dict]:
-        """在向量数据库中搜索相关chunk"""
-        if not hasattr(self, 'tfidf_matrix') or len(self.chunks) == 0:
-            return []
-
-        # 使用TF-IDF计算相似度
-        query_vec = self.vectorizer.transform([query])
-        similarities = cosine_similarity(query_vec, self.tfidf_matrix).flatten()
-
-        # 获取最相似的top_k个结果
-        top_indices = similarities.argsort()[-top_k:][::-1]
-
-        results = []
-        for idx in top_indices:
-            if idx < len(self.chunks):
-                chunk = self.chunks[idx]
-                results.append({
-                    **chunk,
-                    'similarity': similarities[idx]
-                })
-
-        return results
+        """添加论文到向量数据库（已收录的论文会被跳过）"""
+        from scipy import sparse
+
+        # 入库互斥进行；耗时的拟合和保存都不持有self.lock，只在替换索引时短暂加锁，检索不会被阻塞
+        with self.ingest_lock:
+            with self.lock:
+                self._ensure_loaded()
+
+            new_papers = {}
+            new_paper_ids, new_chunk_indices, new_contents = [], [], []
+            for paper in papers:
+                if paper.paper_id in self.papers_by_id or paper.paper_id in new_papers:
+                    continue
+                new_papers[paper.paper_id] = paper
+
+                # 将论文摘要分成多个chunk
+                summary = paper.summary
+                starts = range(0, len(summary), CHUNK_SIZE)
+                new_paper_ids.extend([paper.paper_id] * len(starts))
+                new_chunk_indices.extend(range(len(starts)))
+                new_contents.extend(summary[start:start + CHUNK_SIZE] for start in starts)
+
+            if not new_contents:
+                return
+
+            # 使用TF-IDF进行文本相似度计算（简化版本）
+            # 词表增长到一定程度前只对新chunk做transform，避免每次全量重新拟合
+            num_chunks = self.num_chunks + len(new_contents)
+            refit = self.vectorizer is None or num_chunks - self.fitted_count >= self.fitted_count * REFIT_GROWTH_RATIO
+            if refit:
+                vectorizer, tfidf_matrix_T = self._fit(self.chunk_content + new_contents)
+            else:
+                vectorizer = self.vectorizer
+                new_matrix = vectorizer.transform(new_contents)
+                # 两块都为CSR时hstack直接拼接底层数组，否则会先整体转换为COO
+                new_matrix_T = self._quantize(new_matrix.T.tocsr())
+                tfidf_matrix_T = sparse.hstack([self.tfidf_matrix_T, new_matrix_T], format='csr')
+                assert tfidf_matrix_T.format == 'csr'
+
+            with self.lock:
+                n = self.num_chunks
+                self._reserve(num_chunks)
+                self.chunk_paper_id[n:num_chunks] = new_paper_ids
+                self.chunk_index[n:num_chunks] = new_chunk_indices
+                self.chunk_content.extend(new_contents)
+                self.papers_by_id.update(new_papers)
+                self.num_chunks = num_chunks
+                self.vectorizer = vectorizer
+                self.tfidf_matrix_T = tfidf_matrix_T
+                if refit:
+                    self.fitted_count = num_chunks
+                    self.query_cache.clear()
+
+            if refit:
+                logger.info(f"向量数据库已重新拟合，包含 {num_chunks} 个chunk")
+            else:
+                logger.info(f"向量数据库已增量更新，包含 {num_chunks} 个chunk")
+
+            # 保存需要序列化整个索引，增量更新时按时间间隔合并保存，避免每次入库都重写全部数据
+            self.dirty = True
+            if refit or time.monotonic() - self.last_saved >= VECTOR_DB_SAVE_INTERVAL:
+                self.save(VECTOR_DB_PATH)
+
+    def flush(self):
+        """将尚未保存的更新写入磁盘"""
+        with self.ingest_lock:
+            if self.dirty:
+                self.save(VECTOR_DB_PATH)
+
+    def refit(self):
+        """基于全部chunk重新拟合TF-IDF词表"""
+        with self.ingest_lock:
+            with self.lock:
+                self._ensure_loaded()
+            if self.num_chunks == 0:
+                return
+
+            vectorizer, tfidf_matrix_T = self._fit(self.chunk_content)
+            with self.lock:
+                self.vectorizer = vectorizer
+                self.tfidf_matrix_T = tfidf_matrix_T
+                self.fitted_count = self.num_chunks
+                self.query_cache.clear()
+            logger.info(f"向量数据库已重新拟合，包含 {self.num_chunks} 个chunk")
+
+            self.save(VECTOR_DB_PATH)
+
+    def _fit(self, texts: List[str]):
+        """在给定文本上拟合TF-IDF词表，返回向量化器和按词项组织的量化矩阵"""
+        try:
+            vectorizer = self._build_vectorizer(min_df=2, max_df=0.95)
+            tfidf_matrix = vectorizer.fit_transform(texts)
+        except ValueError:
+            # chunk较少时按文档频率剪枝可能把词表剪空，此时退回不剪枝
+            vectorizer = self._build_vectorizer()
+            tfidf_matrix = vectorizer.fit_transform(texts)
+
+        # 向量已做L2归一化，点积即余弦相似度
+        tfidf_matrix_T = self._quantize(tfidf_matrix.T.tocsr())
+        assert tfidf_matrix_T.format == 'csr'
+        return vectorizer, tfidf_matrix_T
+
+    @staticmethod
+    def _build_vectorizer(**kwargs) -> "TfidfVectorizer":
+        """创建TF-IDF向量化器，使用float32减少矩阵占用的内存"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        return TfidfVectorizer(
+            max_features=20000,
+            stop_words='english',
+            ngram_range=(1, 2),
+            sublinear_tf=True,
+            norm='l2',
+            dtype=np.float32,
+            **kwargs
+        )
+
+    @staticmethod
+    def _quantize(matrix):
+        """将CSR矩阵的权重量化为int8，舍入为0的项直接移除"""
+        matrix.data = np.rint(matrix.data * TFIDF_QUANT_SCALE).astype(np.int8)
+        matrix.eliminate_zeros()
+        return matrix
+
+    def save(self, path: Path):
+        """将向量数据库持久化到磁盘"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再替换，避免进程中断时留下损坏的文件
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            state = {key: value for key, value in self.__dict__.items() if key not in self.TRANSIENT_FIELDS}
+            # 论文元数据按普通dict保存，避免文件依赖Paper类所在的模块名（直接运行main.py时为__main__）
+            # 摘要已按chunk保存在chunk_content中，不再重复保存
+            state['papers_by_id'] = {
+                paper_id: paper.model_dump(exclude={'summary'})
+                for paper_id, paper in self.papers_by_id.items()
+            }
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+        self.dirty = False
+        self.last_saved = time.monotonic()
+
+    def load(self, path: Path):
+        """从磁盘加载向量数据库，文件不存在或损坏时保持为空库"""
+        if not path.exists():
+            return
+
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+            tfidf_matrix_T = state.get('tfidf_matrix_T')
+            if tfidf_matrix_T is not None and tfidf_matrix_T.shape[1] != state.get('num_chunks'):
+                raise ValueError("索引与chunk数量不一致")
+            if tfidf_matrix_T is not None and tfidf_matrix_T.dtype != np.int8:
+                # 旧版本保存的是浮点权重，统一量化后才能与新增的chunk拼接
+                state['tfidf_matrix_T'] = self._quantize(tfidf_matrix_T)
+            # 按chunk顺序拼接还原各论文的摘要
+            summary_parts = defaultdict(list)
+            for paper_id, content in zip(state['chunk_paper_id'][:state['num_chunks']], state['chunk_content']):
+                summary_parts[paper_id].append(content)
+            state['papers_by_id'] = {
+                paper_id: Paper.model_construct(**{**fields, 'summary': ''.join(summary_parts[paper_id])})
+                for paper_id, fields in state.get('papers_by_id', {}).items()
+            }
+            self.__dict__.update(state)
+            self.query_cache.clear()
+            logger.info(f"已从 {path} 加载向量数据库，包含 {self.num_chunks} 个chunk")
+        except Exception as e:
+            logger.warning(f"加载向量数据库失败，将重新构建: {e}")
+
+    def is_ready(self) -> bool:
+        """索引是否已构建完成，可以检索（会先加载磁盘上保存的索引）"""
+        with self.lock:
+            self._ensure_loaded()
+            return self.tfidf_matrix_T is not None
+
+    def _ensure_loaded(self):
+        """首次读写索引时再加载保存的索引（反序列化会导入sklearn），调用方需持有锁"""
+        if not self.loaded:
+            self.loaded = True
+            self.load(VECTOR_DB_PATH)
+
+    def _vectorize_query(self, query: str):
+        """将查询文本转换为TF-IDF向量，重复的查询直接复用缓存结果（调用方需持有锁）"""
+        query_vec = self.query_cache.get(query)
+        if query_vec is None:
+            query_vec = self.vectorizer.transform([query])
+            self.query_cache[query] = query_vec
+            if len(self.query_cache) > QUERY_CACHE_SIZE:
+                self.query_cache.popitem(last=False)
+        else:
+            self.query_cache.move_to_end(query)
+        return query_vec
+
+    def _score(self, query_vec) -> Tuple[np.ndarray, np.ndarray]:
+        """计算查询向量与各chunk的相似度，返回有非零得分的chunk下标及得分（调用方需持有锁）"""
+        # 只取出查询词对应的倒排列表并转换为float32，直接与int8矩阵相乘会把整个矩阵转换一遍
+        rows = self.tfidf_matrix_T[query_vec.indices]
+        weights = np.repeat(query_vec.data / TFIDF_QUANT_SCALE, np.diff(rows.indptr))
+        values = rows.data.astype(np.float32) * weights
+        # 合并同一chunk在多个查询词下的得分
+        indices, inverse = np.unique(rows.indices, return_inverse=True)
+        scores = np.bincount(inverse, weights=values, minlength=len(indices)).astype(np.float32)
+        return indices, scores
+
+    def search(self, query: str, top_k: int = 5) -> Tuple[List[Paper], List[int], List[str], np.ndarray]:
+        """在向量数据库中搜索相关chunk，按相似度从高到低返回命中chunk所属论文、chunk序号、内容及相似度"""
+        with self.lock:
+            self._ensure_loaded()
+            if self.tfidf_matrix_T is None or self.num_chunks == 0:
+                return [], [], [], np.empty(0, dtype=np.float32)
+
+            query_vec = self._vectorize_query(query)
+            score_indices, data = self._score(query_vec)
+
+            # 只在非零得分中选取最相似的top_k个结果：先用argpartition线性时间选出top_k，再只对这k个排序
+            if 0 < top_k < len(data):
+                order = np.argpartition(data, -top_k)[-top_k:]
+                order = order[np.argsort(-data[order], kind='stable')]
+            else:
+                order = np.argsort(-data, kind='stable')[:top_k]
+            indices = score_indices[order].astype(np.intp)
+            similarities = data[order]
+
+            # 匹配不足top_k时用最近加入的chunk补齐，保持与原先全量排序一致的返回数量
+            missing = min(top_k, self.num_chunks) - len(indices)
+            if missing > 0:
+                recent = np.arange(self.num_chunks - 1, max(self.num_chunks - 1 - top_k - len(indices), -1), -1)
+                padding = recent[~np.isin(recent, indices)][:missing]
+                indices = np.concatenate([indices, padding])
+                similarities = np.concatenate([similarities, np.zeros(len(padding), dtype=similarities.dtype)])
+
+            # 在持锁期间按下标取出命中chunk的各列，论文元数据只按paper_id查一次
+            papers = [self.papers_by_id[paper_id] for paper_id in np.take(self.chunk_paper_id, indices)]
+            chunk_indices = np.take(self.chunk_index, indices).tolist()
+            contents = [self.chunk_content[idx] for idx in indices]
+            return papers, chunk_indices, contents, similarities
+
+
+# 问答结果缓存类
+class AnswerCache:
+    def __init__(self, path: Path):
+        self.path = path
+        self.conn = None
+        self.lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """首次使用时再打开数据库连接"""
+        if self.conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS answers (key BLOB PRIMARY KEY, answer TEXT NOT NULL)")
+        return self.conn
+
+    @staticmethod
+    def make_key(question: str, paper_ids: List[str], chunk_indices: List[int]) -> bytes:
+        """根据模型、问题和检索到的chunk生成缓存键"""
+        chunk_ids = sorted(f"{paper_id}#{chunk_index}" for paper_id, chunk_index in zip(paper_ids, chunk_indices))
+        h = hashlib.blake2b(digest_size=16)
+        for part in [OLLAMA_MODEL, question, *chunk_ids]:
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        with self.lock:
+            row = self._connect().execute("SELECT answer FROM answers WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: bytes, answer: str):
+        with self.lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO answers (key, answer) VALUES (?, ?)", (key, answer))
+            # rowid随写入递增，只保留最近写入的ANSWER_CACHE_MAX_ROWS条
+            conn.execute(
+                "DELETE FROM answers WHERE rowid <= (SELECT MAX(rowid) FROM answers) - ?",
+                (ANSWER_CACHE_MAX_ROWS,)
+            )
+            conn.commit()
 
 
 # 全局向量数据库实例
 vector_db = VectorDB()
+answer_cache = AnswerCache(ANSWER_CACHE_PATH)
+# 正在后台执行的入库任务，保留引用避免任务被提前回收
+ingest_tasks = set()
+
+
+def _on_ingest_done(task: asyncio.Task):
+    ingest_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"更新向量数据库失败: {task.exception()}")
 
 
-def call_ollama(messages: List[Dict]) -> str:
+async def call_ollama(messages: List[Dict]) -> str:
     """调用本地Ollama模型"""
     url = f"{OLLAMA_BASE_URL}/api/chat"
     payload = {
@@ -154,7 +483,7 @@ def call_ollama(messages: List[Dict]) -> str:
     }
 
     try:
-        response = requests.post(url, json=payload, timeout=60)
+        response = await http_client.post(url, json=payload)
         response.raise_for_status()
         data = response.json()
         return data["message"]["content"]
@@ -163,8 +492,39 @@ def call_ollama(messages: List[Dict]) -> str:
         raise HTTPException(status_code=500, detail=f"模型调用失败: {str(e)}")
 
 
+async def stream_ollama(messages: List[Dict]) -> AsyncIterator[str]:
+    """以流式方式调用本地Ollama模型，逐段返回生成的内容"""
+    url = f"{OLLAMA_BASE_URL}/api/chat"
+    payload = {
+        "model": OLLAMA_MODEL,
+        "messages": messages,
+        "stream": True
+    }
+
+    async with http_client.stream("POST", url, json=payload) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            data = json.loads(line)
+            if "error" in data:
+                raise RuntimeError(data["error"])
+            content = data.get("message", {}).get("content")
+            if content:
+                yield content
+            if data.get("done"):
+                break
+
+
+def format_sse(event: str, data) -> str:
+    """将数据编码为一条SSE事件"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 def search_arxiv_papers(query: str, max_results: int = 20, sort_by: str = "relevance") -> List[Paper]:
     """搜索ArXiv论文"""
+    import arxiv
+
     try:
         # 配置搜索参数
         if sort_by == "date":
@@ -174,7 +534,8 @@ def search_arxiv_papers(query: str, max_results: int = 20, sort_by: str = "relev
         else:
             sort_criterion = arxiv.SortCriterion.Relevance
 
-        client = arxiv.Client()
+        # arxiv库默认每页请求100条，结果较少时按需请求，避免下载和解析多余的条目
+        client = arxiv.Client(page_size=max(1, min(max_results, ARXIV_MAX_PAGE_SIZE)))
         search = arxiv.Search(
             query=query,
             max_results=max_results,
@@ -183,7 +544,8 @@ def search_arxiv_papers(query: str, max_results: int = 20, sort_by: str = "relev
 
         papers = []
         for result in client.results(search):
-            paper = Paper(
+            # 字段均来自arxiv库解析后的结果，类型已确定，跳过pydantic校验
+            paper = Paper.model_construct(
                 paper_id=result.entry_id.split('/')[-1],
                 title=result.title,
                 authors=[author.name for author in result.authors],
@@ -213,15 +575,18 @@ async def root():
 async def search_papers(request: SearchRequest):
     """搜索论文接口"""
     try:
-        # 搜索论文
-        papers = search_arxiv_papers(
+        # 搜索论文（arxiv库是同步的，放到线程中执行避免阻塞事件循环）
+        papers = await asyncio.to_thread(
+            search_arxiv_papers,
             query=request.query,
             max_results=request.max_results,
             sort_by=request.sort_by
         )
 
-        # 更新向量数据库
-        vector_db.add_papers(papers)
+        # 在后台更新向量数据库，搜索结果不依赖索引，无需等待
+        task = asyncio.create_task(asyncio.to_thread(vector_db.add_papers, papers))
+        ingest_tasks.add(task)
+        task.add_done_callback(_on_ingest_done)
 
         # 分页处理
         start_idx = (request.page - 1) * request.page_size
@@ -242,59 +607,89 @@ async def search_papers(request: SearchRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/ask", response_model=AskResponse)
+@app.post("/ask")
 async def ask_question(request: AskRequest):
-    """RAG问答接口"""
+    """RAG问答接口，以SSE流式返回：先发送citations事件，再逐段发送token事件，最后发送done事件"""
     try:
+        # 等待刚发起的入库任务，保证能检索到最近搜索到的论文
+        if ingest_tasks:
+            await asyncio.wait(set(ingest_tasks), timeout=INGEST_WAIT_TIMEOUT)
+            if ingest_tasks and not await asyncio.to_thread(vector_db.is_ready):
+                raise HTTPException(status_code=425, detail="论文索引正在构建中，请稍后重试")
+
         # 在向量数据库中搜索相关chunk
-        relevant_chunks = vector_db.search(request.question, top_k=request.top_k)
+        papers, chunk_indices, contents, _ = await asyncio.to_thread(
+            vector_db.search, request.question, top_k=request.top_k
+        )
 
-        if not relevant_chunks:
+        if not papers:
             raise HTTPException(status_code=404, detail="未找到相关论文内容")
 
-        # 构建上下文
-        context = "以下是从相关论文中检索到的内容：\n\n"
-        for i, chunk in enumerate(relevant_chunks):
-            context += f"【论文 {i + 1}】{chunk['title']}\n"
-            context += f"作者：{', '.join(chunk['authors'])}\n"
-            context += f"内容：{chunk['content']}\n\n"
+        # 构建上下文，先收集各段再一次性拼接
+        parts = [CONTEXT_HEADER]
+        append = parts.append
+        format_chunk = CONTEXT_CHUNK_TEMPLATE.format
+        for i, (paper, content) in enumerate(zip(papers, contents)):
+            append(format_chunk(
+                index=i + 1,
+                title=paper.title,
+                authors=', '.join(paper.authors),
+                content=content
+            ))
+        context = ''.join(parts)
 
         # 构建提示词
-        prompt = f"""基于以下论文内容，请回答用户的问题。
-
-论文内容：
-{context}
-
-用户问题：{request.question}
-
-请基于上述论文内容提供准确、专业的回答，并注明信息来源。如果论文内容不足以回答问题，请说明情况。"""
+        prompt = PROMPT_TEMPLATE.format_map({"context": context, "question": request.question})
 
         # 调用Ollama模型
         messages = [
-            {"role": "system", "content": "你是一个专业的学术助手，基于提供的论文内容回答用户问题。"},
+            SYSTEM_MESSAGE,
             {"role": "user", "content": prompt}
         ]
 
-        answer = call_ollama(messages)
-
-        # 构建引用信息
+        # 构建引用信息（字段均来自已入库的论文，跳过pydantic校验）
         citations = []
-        for chunk in relevant_chunks:
-            citation = Citation(
-                paper_id=chunk['paper_id'],
-                title=chunk['title'],
-                authors=chunk['authors'],
-                arxiv_url=chunk['arxiv_url'],
-                pdf_url=chunk.get('pdf_url'),
-                chunk_index=chunk['chunk_index'],
-                content=chunk['content'][:200] + "..."  # 截取部分内容
+        for paper, chunk_index, content in zip(papers, chunk_indices, contents):
+            citation = Citation.model_construct(
+                paper_id=paper.paper_id,
+                title=paper.title,
+                authors=paper.authors,
+                arxiv_url=paper.arxiv_url,
+                pdf_url=paper.pdf_url,
+                chunk_index=chunk_index,
+                content=content[:200] + "..."  # 截取部分内容
             )
             citations.append(citation)
 
-        return AskResponse(
-            answer=answer,
-            citations=citations
-        )
+        cache_key = AnswerCache.make_key(request.question, [paper.paper_id for paper in papers], chunk_indices)
+
+        async def event_generator():
+            yield format_sse("citations", [citation.model_dump() for citation in citations])
+
+            # 相同问题和相同检索结果直接复用缓存的回答
+            answer = await asyncio.to_thread(answer_cache.get, cache_key)
+            if answer is not None:
+                yield format_sse("token", {"content": answer})
+                yield format_sse("done", {})
+                return
+
+            parts = []
+            try:
+                async for content in stream_ollama(messages):
+                    parts.append(content)
+                    yield format_sse("token", {"content": content})
+            except Exception as e:
+                # 响应头已经发出，只能通过事件通知前端出错
+                logger.error(f"调用Ollama失败: {e}")
+                yield format_sse("error", {"detail": f"模型调用失败: {str(e)}"})
+                return
+
+            # 模型没有返回任何内容时不写入缓存，避免之后相同的问题一直得到空回答
+            if parts:
+                await asyncio.to_thread(answer_cache.set, cache_key, "".join(parts))
+            yield format_sse("done", {})
+
+        return StreamingResponse(event_generator(), media_type="text/event-stream")
 
     except HTTPException:
         raise
@@ -308,7 +703,7 @@ async def health_check():
     """健康检查接口"""
     try:
         # 测试Ollama连接
-        test_response = call_ollama([{"role": "user", "content": "你好"}])
+        test_response = await call_ollama([{"role": "user", "content": "你好"}])
         return {
             "status": "healthy",
             "ollama_connection": "ok",
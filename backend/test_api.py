@@ -95,13 +95,25 @@ def test_ask_api():
         print("🤖 正在向 AI 提问...")
         start_time = time.time()
         
-        response = requests.post(f"{BASE_URL}/ask", json=payload, timeout=60)
-        
+        response = requests.post(f"{BASE_URL}/ask", json=payload, timeout=60, stream=True)
+
         if response.status_code == 200:
-            data = response.json()
-            answer = data.get('answer', '')
-            citations = data.get('citations', [])
-            
+            # 解析SSE流：citations事件、若干token事件、done事件
+            answer = ''
+            citations = []
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith('event: '):
+                    event = line[len('event: '):]
+                elif line.startswith('data: '):
+                    data = json.loads(line[len('data: '):])
+                    if event == 'citations':
+                        citations = data
+                    elif event == 'token':
+                        answer += data['content']
+                    elif event == 'error':
+                        raise RuntimeError(data['detail'])
+
             elapsed_time = time.time() - start_time
             print(f"✅ 问答成功 (耗时: {elapsed_time:.2f}s)")
             print(f"📝 AI 回答: {answer[:100]}...")
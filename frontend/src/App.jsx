@@ -168,9 +168,30 @@ export default function App() {
         body: JSON.stringify({ query, question, max_results: 5, top_k: 5 })
       })
       if (!res.ok) throw new Error(await res.text())
-      const data = await res.json()
-      setAnswer(data.answer)
-      setCitations(data.citations || [])
+      // 后端以SSE流式返回：citations事件、若干token事件、done事件
+      const reader = res.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+        const events = buffer.split('\n\n')
+        buffer = events.pop()
+        for (const raw of events) {
+          let event = 'message'
+          let data = ''
+          for (const line of raw.split('\n')) {
+            if (line.startsWith('event: ')) event = line.slice(7)
+            else if (line.startsWith('data: ')) data += line.slice(6)
+          }
+          if (!data) continue
+          const payload = JSON.parse(data)
+          if (event === 'citations') setCitations(payload)
+          else if (event === 'token') setAnswer(prev => prev + payload.content)
+          else if (event === 'error') throw new Error(payload.detail)
+        }
+      }
     } catch (e) {
       setError(String(e))
     } finally {
@@ -349,7 +370,7 @@ export default function App() {
               </button>
             </div>
             
-            {loadingAsk ? (
+            {loadingAsk && !answer ? (
               <div className="skeleton-container">
                 <div className="skeleton-item">
                   <div className="skeleton-line long"></div>